@@ -10,9 +10,9 @@
 #include <CondFormats/JetMETObjects/interface/JetCorrectorParameters.h>
 #include <JetMETCorrections/Objects/interface/JetCorrectionsRecord.h>
 
-#include <CLHEP/Random/RandGaussQ.h>
+#include <DataFormats/Math/interface/deltaR.h>
 
-#include <Math/GenVector/VectorUtil.h>
+#include <CLHEP/Random/RandGaussQ.h>
 
 #include <algorithm>
 #include <cmath>
@@ -64,6 +64,12 @@ void JERCJetSelector::fillDescriptions(edm::ConfigurationDescriptions &descripti
 
 void JERCJetSelector::beginRun(edm::Run const &, edm::EventSetup const &setup)
 {
+    // The providers are only used to evaluate variations. Do not read conditions if they are not
+    //requested (as is the case for data)
+    if (not includeJERCVariations)
+        return;
+    
+    
     // Construct an object to obtain JEC uncertainty [1]
     //[1] https://twiki.cern.ch/twiki/bin/view/CMSPublic/WorkBookJetEnergyCorrections?rev=137#JetCorUncertainties
     edm::ESHandle<JetCorrectorParametersCollection> jecParametersCollection;
@@ -259,9 +265,14 @@ reco::GenJet const *JERCJetSelector::MatchGenJet(reco::Jet const &jet,
     double minDR2 = std::numeric_limits<double>::infinity();
     double const maxDR2 = jetConeSize * jetConeSize / 4.;
     
+    // Pseudorapidity and azimuthal angle of the reconstructed jet do not change in the loop below.
+    //Compute them only once instead of converting the Cartesian four-momentum for each
+    //generator-level jet.
+    double const jetEta = jet.eta(), jetPhi = jet.phi();
+    
     for (auto const &genJet: genJets)
     {
-        double const dR2 = ROOT::Math::VectorUtil::DeltaR2(jet.p4(), genJet.p4());
+        double const dR2 = reco::deltaR2(jetEta, jetPhi, genJet.eta(), genJet.phi());
         
         if (dR2 > maxDR2 or dR2 > minDR2)
             continue;
@@ -48,7 +48,11 @@ public:
     JERCJetSelector(edm::ParameterSet const &cfg);
     
 public:
-    /// Creates objects that provide JEC uncertainty and JER resolution and scale factors
+    /**
+     * \brief Creates objects that provide JEC uncertainty and JER resolution and scale factors
+     * 
+     * Does nothing if JERC variations are not requested.
+     */
     virtual void beginRun(edm::Run const &, edm::EventSetup const &setup) override;
     
     /// Verifies plugin configuration
@@ -25,12 +25,25 @@ bool PATCandViewCountMultiFilter::filter(edm::Event &event, edm::EventSetup cons
         event.getByToken(sourceToken, collection);
         
         
+        // If the collection is too small to satisfy the upper bound, the event can be accepted as
+        //soon as enough candidates have passed the selection, and remaining candidates need not
+        //be checked
+        bool const canStopEarly = (collection->size() <= maxNumber);
+        
+        
         // Loop over the collection and count how many candidates pass the selection
         unsigned nPassed = 0;
         
         for (auto const &candidate: *collection)
+        {
             if (selection(candidate))
+            {
                 ++nPassed;
+                
+                if (canStopEarly and nPassed >= minNumber)
+                    return true;
+            }
+        }
         
         
         // Check the number of selected candidates
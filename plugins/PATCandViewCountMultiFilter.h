@@ -5,6 +5,12 @@
  * For each collection it counts candidates that pass a user-defined selection. If the number of
  * selected candidates in at least one of the collections matches the desired range, the event is
  * accepted.
+ * 
+ * Collections are checked in the order in which they are given in the configuration, and a
+ * collection is only read if all preceding ones have failed the requirement. With unscheduled
+ * execution this means that producers of the subsequent collections are not run when an earlier
+ * collection is sufficient to accept the event. For this reason the nominal collection should be
+ * given first.
  */
 
 #pragma once
@@ -16,7 +16,9 @@ using namespace std;
 PECElectrons::PECElectrons(ParameterSet const &cfg):
     embeddedBoolIDLabels(cfg.getParameter<vector<string>>("embeddedBoolIDs")),
     embeddedContIDLabels(cfg.getParameter<vector<string>>("embeddedContIDs")),
-    eaReader((cfg.getParameter<FileInPath>("effAreas")).fullPath())
+    eaReader((cfg.getParameter<FileInPath>("effAreas")).fullPath()),
+    treeAutoFlush(cfg.getParameter<int>("treeAutoFlush")),
+    treeBasketSize(cfg.getParameter<int>("treeBasketSize"))
 {
     // Register required input data
     electronToken = consumes<View<pat::Electron>>(cfg.getParameter<InputTag>("src"));
@@ -58,6 +60,10 @@ void PECElectrons::fillDescriptions(ConfigurationDescriptions &descriptions)
     desc.add<vector<string>>("selection", vector<string>(0))->
       setComment("User-defined selections for electrons whose results will be stored in the "
       "output tree.");
+    desc.add<int>("treeAutoFlush", -30000000)->
+      setComment("Auto-flush setting for the output tree, as in TTree::SetAutoFlush.");
+    desc.add<int>("treeBasketSize", 32000)->
+      setComment("Basket size for branches of the output tree.");
     
     descriptions.add("electrons", desc);
 }
@@ -69,6 +75,9 @@ void PECElectrons::beginJob()
     
     storeElectronsPointer = &storeElectrons;
     outTree->Branch("electrons", &storeElectronsPointer);
+    
+    outTree->SetAutoFlush(treeAutoFlush);
+    outTree->SetBasketSize("*", treeBasketSize);
 }
 
 
@@ -3,18 +3,28 @@
 #include <FWCore/Utilities/interface/InputTag.h>
 #include <FWCore/Framework/interface/MakerMacros.h>
 
+#include <TFile.h>
+
 using namespace edm;
 
 
-PECEventID::PECEventID(ParameterSet const &)
-{}
+PECEventID::PECEventID(ParameterSet const &cfg)
+{
+    int const compressionSettings = cfg.getParameter<int>("compressionSettings");
+    
+    if (compressionSettings >= 0)
+        fileService->file().SetCompressionSettings(compressionSettings);
+}
 
 
 void PECEventID::fillDescriptions(ConfigurationDescriptions &descriptions)
 {
     ParameterSetDescription desc;
+    desc.add<int>("compressionSettings", -1)->
+      setComment("Compression settings for the output file, as in "
+      "TFile::SetCompressionSettings. A negative value keeps the default ones.");
+    
     descriptions.add("eventID", desc);
-    //^ The configuration is trivial
 }
 
 
@@ -17,6 +17,13 @@
 /**
  * \class PECEventID
  * \brief Stores event ID (run, luminosity block, and event number)
+ * 
+ * Optionally, the plugin also sets compression settings of the output file of TFileService,
+ * according to parameter "compressionSettings". This is a file-wide setting with a side effect on
+ * other modules: it is applied in the constructor, before any module creates its output tree, and
+ * thus affects the trees of all plugins that write to the file, not only the tree of this one.
+ * The value follows the convention of TFile::SetCompressionSettings, i.e. 100 * algorithm + level.
+ * A negative value leaves the default settings unchanged.
  */
 class PECEventID: public edm::EDAnalyzer
 {
@@ -24,9 +31,9 @@ public:
     /**
      * \brief Constructor
      * 
-     * The plugin has a trivial configuration, and thus the constructor does not read it.
+     * Applies compression settings to the whole output file of TFileService if requested.
      */
-    PECEventID(edm::ParameterSet const &);
+    PECEventID(edm::ParameterSet const &cfg);
     
 public:
     /// Verifies configuration of the plugin
@@ -17,7 +17,9 @@ using namespace edm;
 PECGenJetMET::PECGenJetMET(edm::ParameterSet const &cfg):
     jetSelector(cfg.getParameter<string>("cut")),
     saveFlavourCounters(cfg.getParameter<bool>("saveFlavourCounters")),
-    noDoubleCounting(cfg.getParameter<bool>("noDoubleCounting"))
+    noDoubleCounting(cfg.getParameter<bool>("noDoubleCounting")),
+    treeAutoFlush(cfg.getParameter<int>("treeAutoFlush")),
+    treeBasketSize(cfg.getParameter<int>("treeBasketSize"))
 {
     // Register required input data
     jetToken = consumes<View<reco::GenJet>>(cfg.getParameter<InputTag>("jets"));
@@ -44,6 +46,10 @@ void PECGenJetMET::fillDescriptions(ConfigurationDescriptions &descriptions)
     desc.add<bool>("noDoubleCounting", true)->
      setComment("Indicates if same heavy-flavour hadron can be counted in several jets.");
     desc.addOptional<InputTag>("met")->setComment("MET.");
+    desc.add<int>("treeAutoFlush", -30000000)->
+     setComment("Auto-flush setting for the output tree, as in TTree::SetAutoFlush.");
+    desc.add<int>("treeBasketSize", 32000)->
+     setComment("Basket size for branches of the output tree.");
     
     descriptions.add("genJetMET", desc);
 }
@@ -63,6 +69,9 @@ void PECGenJetMET::beginJob()
         storeMETsPointer = &storeMETs;
         tree->Branch("METs", &storeMETsPointer);
     }
+    
+    tree->SetAutoFlush(treeAutoFlush);
+    tree->SetBasketSize("*", treeBasketSize);
 }
 
 
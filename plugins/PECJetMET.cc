@@ -19,7 +19,9 @@ using namespace std;
 
 PECJetMET::PECJetMET(edm::ParameterSet const &cfg):
     runOnData(cfg.getParameter<bool>("runOnData")),
-    rawJetMomentaOnly(cfg.getParameter<bool>("rawJetMomentaOnly"))
+    rawJetMomentaOnly(cfg.getParameter<bool>("rawJetMomentaOnly")),
+    treeAutoFlush(cfg.getParameter<int>("treeAutoFlush")),
+    treeBasketSize(cfg.getParameter<int>("treeBasketSize"))
 {
     // Register required input data
     jetToken = consumes<edm::View<pat::Jet>>(cfg.getParameter<InputTag>("jets"));
@@ -64,6 +66,10 @@ void PECJetMET::fillDescriptions(edm::ConfigurationDescriptions &descriptions)
     desc.add<InputTag>("met")->setComment("MET.");
     desc.add<vector<InputTag>>("metCorrToUndo", vector<InputTag>())->
       setComment("MET corrections to undo for (partly) uncorreted METs.");
+    desc.add<int>("treeAutoFlush", -30000000)->
+      setComment("Auto-flush setting for the output tree, as in TTree::SetAutoFlush.");
+    desc.add<int>("treeBasketSize", 32000)->
+      setComment("Basket size for branches of the output tree.");
     
     descriptions.add("jetMET", desc);
 }
@@ -84,6 +90,9 @@ void PECJetMET::beginJob()
     outTree->Branch("uncorrMETs", &storeUncorrMETsPointer);
     
     outTree->Branch("METSignificance", &storeMETSignificance);
+    
+    outTree->SetAutoFlush(treeAutoFlush);
+    outTree->SetBasketSize("*", treeBasketSize);
 }
 
 
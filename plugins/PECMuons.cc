@@ -12,7 +12,9 @@ using namespace edm;
 using namespace std;
 
 
-PECMuons::PECMuons(ParameterSet const &cfg)
+PECMuons::PECMuons(ParameterSet const &cfg):
+    treeAutoFlush(cfg.getParameter<int>("treeAutoFlush")),
+    treeBasketSize(cfg.getParameter<int>("treeBasketSize"))
 {
     // Register required input data
     muonToken = consumes<View<pat::Muon>>(cfg.getParameter<InputTag>("src"));
@@ -35,6 +37,10 @@ void PECMuons::fillDescriptions(ConfigurationDescriptions &descriptions)
      "tree.");
     desc.add<InputTag>("primaryVertices")->
      setComment("Collection of reconstructed primary vertices.");
+    desc.add<int>("treeAutoFlush", -30000000)->
+     setComment("Auto-flush setting for the output tree, as in TTree::SetAutoFlush.");
+    desc.add<int>("treeBasketSize", 32000)->
+     setComment("Basket size for branches of the output tree.");
     
     descriptions.add("eventContent", desc);
 }
@@ -46,6 +52,9 @@ void PECMuons::beginJob()
     
     storeMuonsPointer = &storeMuons;
     outTree->Branch("muons", &storeMuonsPointer);
+    
+    outTree->SetAutoFlush(treeAutoFlush);
+    outTree->SetBasketSize("*", treeBasketSize);
 }
 
 
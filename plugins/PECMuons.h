@@ -77,6 +77,18 @@ private:
     edm::Service<TFileService> fileService;
     
     
+    /**
+     * \brief Auto-flush setting for the output tree
+     * 
+     * Follows the convention of TTree::SetAutoFlush: a positive value gives the number of entries
+     * per cluster, a negative one the number of bytes.
+     */
+    int const treeAutoFlush;
+    
+    /// Basket size for all branches of the output tree
+    int const treeBasketSize;
+    
+    
     /// Output tree
     TTree *outTree;
     
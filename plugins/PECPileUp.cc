@@ -16,7 +16,9 @@ using namespace std;
 
 PECPileUp::PECPileUp(ParameterSet const &cfg):
     runOnData(cfg.getParameter<bool>("runOnData")),
-    saveMaxPtHat(cfg.getParameter<bool>("saveMaxPtHat"))
+    saveMaxPtHat(cfg.getParameter<bool>("saveMaxPtHat")),
+    treeAutoFlush(cfg.getParameter<int>("treeAutoFlush")),
+    treeBasketSize(cfg.getParameter<int>("treeBasketSize"))
 {
     if (runOnData)
         saveMaxPtHat = false;
@@ -47,6 +49,10 @@ void PECPileUp::fillDescriptions(ConfigurationDescriptions &descriptions)
       "ignored.");
     desc.add<bool>("saveMaxPtHat", false)->
       setComment("Indicates whether largest ptHat in in-time pile-up should be stored.");
+    desc.add<int>("treeAutoFlush", -30000000)->
+      setComment("Auto-flush setting for the output tree, as in TTree::SetAutoFlush.");
+    desc.add<int>("treeBasketSize", 32000)->
+      setComment("Basket size for branches of the output tree.");
     
     descriptions.add("pileUp", desc);
 }
@@ -58,6 +64,9 @@ void PECPileUp::beginJob()
     
     puInfoPointer = &puInfo;
     outTree->Branch("puInfo", &puInfoPointer);
+    
+    outTree->SetAutoFlush(treeAutoFlush);
+    outTree->SetBasketSize("*", treeBasketSize);
 }
 
 
@@ -87,6 +87,10 @@ struct TriggerState
  * The plugin can be configured in such a way that it rejects an event if it is not accepted by any
  * of the selected triggers. The default behaviour is to reject no events.
  * 
+ * Trigger names in the menu are only matched against the selected triggers when the menu changes,
+ * and the indices of the selected triggers are cached. In each event only the selected triggers
+ * are checked, so the per-event cost does not depend on the size of the menu.
+ * 
  * [1] https://twiki.cern.ch/twiki/bin/view/CMSPublic/WorkBookMiniAOD2015?rev=96#Trigger
  */
 class SlimTriggerResults: public edm::EDFilter
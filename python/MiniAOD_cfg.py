@@ -28,12 +28,20 @@ import FWCore.ParameterSet.Config as cms
 process = cms.Process('Analysis')
 
 
-# Enable MessageLogger and reduce its verbosity
+# Enable MessageLogger and reduce its verbosity.  Apart from the regular
+# event reports, whose limit is set separately in MessageLogger_cfi,
+# print at most ten messages in each category.  Only the default limit
+# below changes the behaviour.
 process.load('FWCore.MessageLogger.MessageLogger_cfi')
 process.MessageLogger.cerr.FwkReport.reportEvery = 1000
+process.MessageLogger.cerr.default.limit = cms.untracked.int32(10)
 
 
-# Ask to print a summary in the log
+# Ask to print a summary in the log.  The unscheduled mode is required
+# since tools for electron ID, jet update, and MET corrections only add
+# producers to the process without scheduling them, and cms.Task is not
+# available in this release.  Producers are executed only if some
+# module on a path requests their products.
 process.options = cms.untracked.PSet(
     wantSummary = cms.untracked.bool(True),
     allowUnscheduled = cms.untracked.bool(True)
@@ -49,6 +57,10 @@ options.register(
     'globalTag', '', VarParsing.multiplicity.singleton, VarParsing.varType.string,
     'Global tag to be used'
 )
+options.register(
+    'globalTagSnapshot', '', VarParsing.multiplicity.singleton, VarParsing.varType.string,
+    'Snapshot time for the global tag, in format "YYYY-MM-DD hh:mm:ss.000"'
+)
 # Leptonic channels to be processed.  Here 'e' and 'm' stand for
 # electron and muon respectively.
 options.register(
@@ -85,7 +97,8 @@ options.register(
 )
 options.register(
     'labelLHEEventProduct', 'externalLHEProducer', VarParsing.multiplicity.singleton,
-    VarParsing.varType.string, 'Label to access LHEEventProduct'
+    VarParsing.varType.string,
+    'Label to access LHEEventProduct.  If empty, LHE-level information is not read'
 )
 options.register(
     'saveGenParticles', True, VarParsing.multiplicity.singleton, VarParsing.varType.bool,
@@ -95,6 +108,14 @@ options.register(
     'saveGenJets', True, VarParsing.multiplicity.singleton, VarParsing.varType.bool,
     'Save information about generator-level jets'
 )
+options.register(
+    'compressionSettings', -1, VarParsing.multiplicity.singleton, VarParsing.varType.int,
+    'Compression settings for the output file (100 * algorithm + level), e.g. 207 for LZMA level 7'
+)
+options.register(
+    'numberOfThreads', 1, VarParsing.multiplicity.singleton, VarParsing.varType.int,
+    'Number of threads.  Not expected to speed up the job in this release'
+)
 
 # Override defaults for automatically defined options
 options.setDefault('maxEvents', 100)
@@ -104,6 +125,7 @@ options.setDefault('outputFile', 'sample.root')
 options.parseArguments()
 print "Arguments:"
 print "             globalTag: " + options.globalTag
+print "     globalTagSnapshot: " + options.globalTagSnapshot
 print "              channels: " + options.channels
 print "                jetSel: " + options.jetSel
 print "            processIDs: " + options.processIDs
@@ -115,12 +137,36 @@ print "     saveAltLHEWeights: " + str(options.saveAltLHEWeights)
 print "  labelLHEEventProduct: " + options.labelLHEEventProduct
 print "      saveGenParticles: " + str(options.saveGenParticles)
 print "           saveGenJets: " + str(options.saveGenJets)
+print "   compressionSettings: " + str(options.compressionSettings)
+print "       numberOfThreads: " + str(options.numberOfThreads)
 print ""
 
-# Make shortcuts to access some of the configuration options easily
+# Make shortcuts to access some of the configuration options easily.
+# Options that require parsing are parsed and validated here, before
+# the process is configured.
 runOnData = options.runOnData
-elChan = (options.channels.find('e') != -1)
-muChan = (options.channels.find('m') != -1)
+channels = frozenset(options.channels)
+
+if not channels <= frozenset('em'):
+    raise RuntimeError('Cannot parse channels "{}".'.format(options.channels))
+
+elChan = ('e' in channels)
+muChan = ('m' in channels)
+
+from Analysis.PECTuples.Utils_cff import parse_jet_selection
+jetSelection = parse_jet_selection(options.jetSel)
+
+
+# Set the number of threads.  Only a single stream is used because all
+# analyzers are legacy modules that fill separate trees: with several
+# streams events could reach them in different orders, and the trees
+# would get out of sync.  Modules on the paths are legacy ones too and
+# are executed one at a time, while unscheduled producers run on demand
+# inside the modules that request their products.  For this reason, in
+# this release the option mainly matters for thread-safe central
+# modules, and it is not expected to speed up the job.
+process.options.numberOfThreads = cms.untracked.uint32(options.numberOfThreads)
+process.options.numberOfStreams = cms.untracked.uint32(1)
 
 
 # Provide a default global tag if user has not given any.  Chosen as
@@ -141,12 +187,38 @@ process.load('Configuration.StandardSequences.FrontierConditions_GlobalTag_condD
 from Configuration.AlCa.GlobalTag_condDBv2 import GlobalTag
 process.GlobalTag = GlobalTag(process.GlobalTag, options.globalTag)
 
+# Freeze the conditions at the given time if requested.  This makes the
+# job reproducible, and since all jobs then send identical queries to
+# Frontier, they are served from the site caches.
+if options.globalTagSnapshot:
+    process.GlobalTag.snapshotTime = cms.string(options.globalTagSnapshot)
+
 
-# Define the input files
+# Define the input files.  Collections that are not used by the job are
+# dropped so that they are never read and deserialized.  A drop-all,
+# keep-some list is not used because recalculation of MET, b-tagging,
+# and electron ID read many collections implicitly (packed PF
+# candidates, photons, taus, secondary vertices, EGamma rechits).
 process.source = cms.Source('PoolSource',
-    inputCommands = cms.untracked.vstring('keep *', 'drop LHERunInfoProduct_*_*_*')
+    inputCommands = cms.untracked.vstring(
+        'keep *', 'drop LHERunInfoProduct_*_*_*',
+        'drop *_slimmedJetsAK8*_*_*', 'drop *_slimmedGenJetsAK8*_*_*',
+        'drop *_slimmedJetsPuppi_*_*', 'drop *_slimmedMETsPuppi_*_*',
+        'drop *_slimmedKshortVertices_*_*', 'drop *_slimmedLambdaVertices_*_*',
+        'drop *_oniaPhotonCandidates_*_*', 'drop *_selectedPatTrigger_*_*',
+        'drop *_l1extraParticles_*_*'
+    ),
+    dropDescendantsOfDroppedBranches = cms.untracked.bool(False),
+    # Use a larger TTreeCache so that baskets are read in fewer, larger
+    # requests, which is especially important for remote files
+    cacheSize = cms.untracked.uint32(100 * 1024 * 1024)
 )
 
+# If LHE-level information is not requested, make sure that it is not
+# even read from the input files
+if not options.labelLHEEventProduct:
+    process.source.inputCommands.append('drop LHEEventProduct_*_*_*')
+
 if len(options.inputFiles) > 0:
     process.source.fileNames = cms.untracked.vstring(options.inputFiles)
 else:
@@ -215,22 +287,55 @@ process.load('Configuration.Geometry.GeometryRecoDB_cff')
 process.load('Configuration.StandardSequences.MagneticField_cff')
 
 
-# Create processing paths.  There is one path per each channel (electron
-# or muon).
-process.elPath = cms.Path()
-process.muPath = cms.Path()
+# Triggers whose decisions are saved.  The lists are based on menu [1],
+# which was used in the re-HLT campaign with RunIISpring16MiniAODv2.
+# [1] /frozen/2016/25ns10e33/v2.1/HLT/V3
+triggerNames = [
+    # Single-lepton paths
+    'Mu17', 'Mu27', 'Mu24_eta2p1', 'Mu20',
+    'Mu45_eta2p1', 'Mu50', 'Mu55',
+    'IsoMu20', 'IsoTkMu20', 'IsoMu22', 'IsoTkMu22', 'IsoMu22_eta2p1', 'IsoTkMu22_eta2p1',
+    'IsoMu24', 'IsoTkMu24', 'IsoMu27', 'IsoTkMu27',
+    'Ele23_WPLoose_Gsf', 'Ele24_eta2p1_WPLoose_Gsf',
+    'Ele25_WPTight_Gsf', 'Ele25_eta2p1_WPLoose_Gsf', 'Ele25_eta2p1_WPTight_Gsf',
+    'Ele27_WPLoose_Gsf', 'Ele27_WPTight_Gsf',
+    'Ele27_eta2p1_WPLoose_Gsf', 'Ele27_eta2p1_WPTight_Gsf',
+    'Ele32_eta2p1_WPTight_Gsf', 'Ele35_WPLoose_Gsf',
+    # Dilepton paths
+    'Mu23_TrkIsoVVL_Ele12_CaloIdL_TrackIdL_IsoVL',
+    'Mu8_TrkIsoVVL_Ele23_CaloIdL_TrackIdL_IsoVL',
+    'Mu17_TrkIsoVVL_Mu8_TrkIsoVVL_DZ', 'Mu17_TrkIsoVVL_TkMu8_TrkIsoVVL_DZ',
+    'Ele23_Ele12_CaloIdL_TrackIdL_IsoVL_DZ',
+    # Cross-triggers
+    'Ele27_eta2p1_WPLoose_Gsf_HT200'
+]
+
+
+# Create processing sequences.  Modules shared by all channels are put
+# into two sequences: the preselection, which is executed before the
+# selection on leptons, and the rest of the event selection together
+# with the analyzers.  Paths for individual channels (electron or muon)
+# are assembled from these sequences at the end of the configuration.
+process.preselectionSequence = cms.Sequence()
+process.analysisSequence = cms.Sequence()
 
 from Analysis.PECTuples.Utils_cff import PathManager
-paths = PathManager(process.elPath, process.muPath)
+preselection = PathManager(process.preselectionSequence)
+paths = PathManager(process.analysisSequence)
 
 
 # Apply filtering on process IDs
 if not runOnData and options.processIDs:
     process.processIDFilter = cms.EDFilter('ProcessIDFilter',
-        lheEventProduct = cms.InputTag(options.labelLHEEventProduct),
         processIDs = cms.vint32([int(i) for i in options.processIDs.split(',')])
     )
-    paths.append(process.processIDFilter)
+    
+    if options.labelLHEEventProduct:
+        process.processIDFilter.lheEventProduct = cms.InputTag(options.labelLHEEventProduct)
+    else:
+        process.processIDFilter.generator = cms.InputTag('generator')
+    
+    preselection.append(process.processIDFilter)
 
 
 # Include an event counter before any selection is applied.  It is only
@@ -241,7 +346,21 @@ if not runOnData:
         saveAltLHEWeights = cms.bool(options.saveAltLHEWeights),
         lheEventProduct = cms.InputTag(options.labelLHEEventProduct)
     )
-    paths.append(process.eventCounter)
+    preselection.append(process.eventCounter)
+
+
+# Reject events that are not accepted by any of the selected triggers.
+# This filter only checks the trigger bits and is very cheap, and thus
+# it is placed before any filter that requires reconstructed objects.
+if not options.disableTriggerFilter:
+    process.triggerPreselection = cms.EDFilter('HLTHighLevel',
+        HLTPaths = cms.vstring(['HLT_' + t + '_v*' for t in triggerNames]),
+        eventSetupPathsKey = cms.string(''),
+        andOr = cms.bool(True),  # OR mode
+        throw = cms.bool(False),
+        TriggerResultsTag = cms.InputTag('TriggerResults', '', options.triggerProcessName)
+    )
+    preselection.append(process.triggerPreselection)
 
 
 # Filter on properties of the first vertex
@@ -250,7 +369,7 @@ process.goodOfflinePrimaryVertices = cms.EDFilter('FirstVertexFilter',
     cut = cms.string('!isFake & ndof > 4. & abs(z) < 24. & position.rho < 2.')
 )
 
-paths.append(process.goodOfflinePrimaryVertices)
+preselection.append(process.goodOfflinePrimaryVertices)
 
 
 # Define basic reconstructed objects
@@ -265,7 +384,8 @@ recorrectedJetsLabel, jetQualityCuts = define_jets(process, reapplyJEC=False, ru
 metTag = define_METs(process, runOnData=runOnData)
 
 
-# The loose event selection
+# The loose event selection.  Filters on leptons are specific for each
+# channel and are inserted when the paths are created.
 process.countTightPatElectrons = cms.EDFilter('PATCandViewCountFilter',
     src = cms.InputTag('patElectronsForEventSelection'),
     minNumber = cms.uint32(1), maxNumber = cms.uint32(999)
@@ -274,17 +394,11 @@ process.countTightPatMuons = cms.EDFilter('PATCandViewCountFilter',
     src = cms.InputTag('patMuonsForEventSelection'),
     minNumber = cms.uint32(1), maxNumber = cms.uint32(999)
 )
-if elChan:
-    process.elPath += process.countTightPatElectrons
-if muChan:
-    process.muPath += process.countTightPatMuons
-
-if options.jetSel:
-    from Analysis.PECTuples.Utils_cff import add_jet_selection
-    add_jet_selection(options.jetSel, process, paths, runOnData)
 
 
-# Apply event filters recommended for analyses involving MET
+# Apply event filters recommended for analyses involving MET.  They are
+# cheap compared to the selection on jets, which requires JEC and
+# b-tagging to be reevaluated, and thus are executed before it.
 from Analysis.PECTuples.EventFilters_cff import apply_event_filters
 apply_event_filters(
     process, paths, runOnData=runOnData,
@@ -292,35 +406,23 @@ apply_event_filters(
 )
 
 
-# Save decisions of selected triggers.  The lists are based on menu [1],
-# which was used in the re-HLT campaign with RunIISpring16MiniAODv2.
-# Events that are not accepted by any of the considered triggers are
-# rejected since they cannot be used in an analysis.
-# [1] /frozen/2016/25ns10e33/v2.1/HLT/V3
-triggerNames = [
-    # Single-lepton paths
-    'Mu17', 'Mu27', 'Mu24_eta2p1', 'Mu20',
-    'Mu45_eta2p1', 'Mu50', 'Mu55',
-    'IsoMu20', 'IsoTkMu20', 'IsoMu22', 'IsoTkMu22', 'IsoMu22_eta2p1', 'IsoTkMu22_eta2p1',
-    'IsoMu24', 'IsoTkMu24', 'IsoMu27', 'IsoTkMu27',
-    'Ele23_WPLoose_Gsf', 'Ele24_eta2p1_WPLoose_Gsf',
-    'Ele25_WPTight_Gsf', 'Ele25_eta2p1_WPLoose_Gsf', 'Ele25_eta2p1_WPTight_Gsf',
-    'Ele27_WPLoose_Gsf', 'Ele27_WPTight_Gsf',
-    'Ele27_eta2p1_WPLoose_Gsf', 'Ele27_eta2p1_WPTight_Gsf',
-    'Ele32_eta2p1_WPTight_Gsf', 'Ele35_WPLoose_Gsf',
-    # Dilepton paths
-    'Mu23_TrkIsoVVL_Ele12_CaloIdL_TrackIdL_IsoVL',
-    'Mu8_TrkIsoVVL_Ele23_CaloIdL_TrackIdL_IsoVL',
-    'Mu17_TrkIsoVVL_Mu8_TrkIsoVVL_DZ', 'Mu17_TrkIsoVVL_TkMu8_TrkIsoVVL_DZ',
-    'Ele23_Ele12_CaloIdL_TrackIdL_IsoVL_DZ',
-    # Cross-triggers
-    'Ele27_eta2p1_WPLoose_Gsf_HT200'
-]
+# Selection on jets is the most expensive part of the loose event
+# selection and is therefore performed last
+from Analysis.PECTuples.Utils_cff import add_jet_selection
+add_jet_selection(jetSelection, process, paths, runOnData)
 
+
+# Save decisions of selected triggers.  The module fills an output tree,
+# and for this reason it must be placed after all other filters;
+# otherwise the trees would get out of sync.  Events that are not
+# accepted by any of the considered triggers have already been rejected
+# by the trigger preselection above (unless the filtering is disabled),
+# and thus this module does not need to filter events.  Prescales are
+# only read for events that have passed the full selection.
 if runOnData:
     process.pecTrigger = cms.EDFilter('SlimTriggerResults',
         triggers = cms.vstring(triggerNames),
-        filter = cms.bool(not options.disableTriggerFilter),
+        filter = cms.bool(False),
         savePrescales = cms.bool(True),
         triggerBits = cms.InputTag('TriggerResults', processName=options.triggerProcessName),
         hltPrescales = cms.InputTag('patTrigger'),
@@ -329,7 +431,7 @@ if runOnData:
 else:
     process.pecTrigger = cms.EDFilter('SlimTriggerResults',
         triggers = cms.vstring(triggerNames),
-        filter = cms.bool(not options.disableTriggerFilter),
+        filter = cms.bool(False),
         savePrescales = cms.bool(False),
         triggerBits = cms.InputTag('TriggerResults', processName=options.triggerProcessName)
     )
@@ -348,8 +450,19 @@ if runOnData:
     paths.append(process.eventFlags)
 
 
-# Save event ID and basic event content
-process.pecEventID = cms.EDAnalyzer('PECEventID')
+# Output trees with the largest event content are flushed every 1000
+# events.  ROOT optimizes basket sizes at the first flush, and a smaller
+# initial basket size reduces the memory footprint before that.
+treeAutoFlush = cms.int32(1000)
+treeBasketSize = cms.int32(16384)
+
+
+# Save event ID and basic event content.  Compression settings given to
+# PECEventID are applied to the whole output file, i.e. to the trees of
+# all other analyzers as well.
+process.pecEventID = cms.EDAnalyzer('PECEventID',
+    compressionSettings = cms.int32(options.compressionSettings)
+)
 
 process.pecElectrons = cms.EDAnalyzer('PECElectrons',
     src = cms.InputTag('analysisPatElectrons'),
@@ -359,13 +472,17 @@ process.pecElectrons = cms.EDAnalyzer('PECElectrons',
     embeddedBoolIDs = cms.vstring(eleEmbeddedCutBasedIDLabels),
     boolIDMaps = cms.VInputTag(eleCutBasedIDMaps),
     contIDMaps = cms.VInputTag(eleMVAIDMaps),
-    selection = eleQualityCuts
+    selection = eleQualityCuts,
+    treeAutoFlush = treeAutoFlush,
+    treeBasketSize = treeBasketSize
 )
 
 process.pecMuons = cms.EDAnalyzer('PECMuons',
     src = cms.InputTag('analysisPatMuons'),
     selection = muQualityCuts,
-    primaryVertices = cms.InputTag('offlineSlimmedPrimaryVertices')
+    primaryVertices = cms.InputTag('offlineSlimmedPrimaryVertices'),
+    treeAutoFlush = treeAutoFlush,
+    treeBasketSize = treeBasketSize
 )
 
 process.pecJetMET = cms.EDAnalyzer('PECJetMET',
@@ -373,7 +490,9 @@ process.pecJetMET = cms.EDAnalyzer('PECJetMET',
     jets = cms.InputTag('analysisPatJets'),
     jetSelection = jetQualityCuts,
     met = metTag,
-    metCorrToUndo = cms.VInputTag(cms.InputTag('patPFMetT1T2Corr', 'type1'))
+    metCorrToUndo = cms.VInputTag(cms.InputTag('patPFMetT1T2Corr', 'type1')),
+    treeAutoFlush = treeAutoFlush,
+    treeBasketSize = treeBasketSize
 )
 
 process.pecPileUp = cms.EDAnalyzer('PECPileUp',
@@ -381,7 +500,9 @@ process.pecPileUp = cms.EDAnalyzer('PECPileUp',
     rho = cms.InputTag('fixedGridRhoFastjetAll'),
     rhoCentral = cms.InputTag('fixedGridRhoFastjetCentral'),
     runOnData = cms.bool(runOnData),
-    puInfo = cms.InputTag('slimmedAddPileupInfo')
+    puInfo = cms.InputTag('slimmedAddPileupInfo'),
+    treeAutoFlush = treeAutoFlush,
+    treeBasketSize = treeBasketSize
 )
 
 paths.append(process.pecEventID, process.pecElectrons, process.pecMuons, process.pecJetMET,
@@ -414,21 +535,29 @@ if not runOnData and options.saveGenJets:
         cut = cms.string('pt > 8.'),
         # ^The pt cut above is the same as in JME-13-005
         saveFlavourCounters = cms.bool(True),
-        met = metTag
+        met = metTag,
+        treeAutoFlush = treeAutoFlush,
+        treeBasketSize = treeBasketSize
     )
     paths.append(process.pecGenJetMET)
 
 
-# If one of possible channels has not been requested by the user, clear
-# the corresponding path
-if not elChan:
-    process.elPath = cms.Path()
-if not muChan:
-    process.muPath = cms.Path()
+# Create paths for the channels requested by the user.  They differ only
+# in the selection on leptons.
+if elChan:
+    process.elPath = cms.Path(
+        process.preselectionSequence + process.countTightPatElectrons +
+        process.analysisSequence
+    )
+if muChan:
+    process.muPath = cms.Path(
+        process.preselectionSequence + process.countTightPatMuons +
+        process.analysisSequence
+    )
 
 
 # The output file for the analyzers
-postfix = '_' + string.join([random.choice(string.letters) for i in range(3)], '')
+postfix = '_' + ''.join(random.choice(string.ascii_letters) for i in range(3))
 
 if options.outputFile.endswith('.root'):
     outputBaseName = options.outputFile[:-5] 
@@ -72,16 +72,17 @@ def define_electrons(process):
             idModule, setupVIDElectronSelection
         )
     
+    # Evaluate the IDs only for electrons that pass the kinematic
+    # selection above rather than for all electrons in MiniAOD
     process.egmGsfElectronIDs.physicsObjectSrc = 'analysisPatElectrons'
     process.electronMVAValueMapProducer.srcMiniAOD = 'analysisPatElectrons'
     
     
-    # Add also customized cut-based ID without requirements on isolation
-    setupAllVIDIdsInModule(
-        process,
-        'Analysis.PECTuples.cutBasedElectronID_nonIso_cff',
-        setupVIDElectronSelection
-    )
+    # Add also customized cut-based ID without requirements on isolation.
+    # Only the tight working point is saved, and thus other working
+    # points defined in the module are not evaluated.
+    from Analysis.PECTuples.cutBasedElectronID_nonIso_cff import cutBasedElectronID_nonIso_tight
+    setupVIDElectronSelection(process, cutBasedElectronID_nonIso_tight)
     
     
     # Labels of maps with electron ID
@@ -1,16 +1,27 @@
 """Utility classes and functions used in the main configuration."""
 
 from __future__ import print_function
+from collections import namedtuple
 import re
 
 import FWCore.ParameterSet.Config as cms
 
 
+# Regular expressions to parse the jet selection string.  They are
+# compiled once, when the module is imported.
+_patternKin = r'(\d+)\s*j\s*(\d+(\.\d+)?)'
+_patternBTag = r'(\d+)\s*([A-Za-z]+)\s*([+-]?\d+(\.\d+)?)'
+
+_jetSelFullRegex = re.compile(r'{}\s+{}\s*$'.format(_patternKin, _patternBTag))
+_jetSelKinRegex = re.compile(_patternKin + r'\s*$')
+_jetSelBTagRegex = re.compile(_patternBTag + r'\s*$')
+
+
 class PathManager:
-    """A class to work with multiple CMS paths simultaneuosly."""
+    """A class to work with multiple CMS paths or sequences simultaneuosly."""
     
     def __init__(self, *paths):
-        """Construct from an arbitrary number of cms.Path."""
+        """Construct from an arbitrary number of cms.Path or cms.Sequence."""
         
         self.paths = list(paths)
     
@@ -18,17 +29,38 @@ class PathManager:
     def append(self, *modules):
         """Append one or more modules to each path."""
         
+        if not modules:
+            return
+        
+        # Combine the modules into a single sequence first so that each
+        # path is only extended once
+        seq = modules[0]
+        
+        for m in modules[1:]:
+            seq = seq + m
+        
         for p in self.paths:
-            for m in modules:
-                p += m
+            p += seq
 
 
-def add_jet_selection(selection, process, paths, runOnData, src='analysisPatJets', verbose=True):
-    """Implement jet selection.
+# Parsed jet selection, as returned by function parse_jet_selection
+JetSelection = namedtuple(
+    'JetSelection', ['minNumJets', 'minPt', 'minBTags', 'bTagAlgo', 'minBDiscr']
+)
+
+
+# Supported b-tagging algorithms and names of their discriminators
+_bTagAlgoMap = {
+    'CSV': 'pfCombinedInclusiveSecondaryVertexV2BJetTags',
+    'CMVA': 'pfCombinedMVAV2BJetTags'
+}
+
+
+def parse_jet_selection(selection):
+    """Parse a string describing the jet selection.
     
-    Add modules implementing a loose event selection based on properties
-    of jets to the process.  The selection is described with a text
-    string of the following form:
+    The selection is described with a text string of the following
+    form:
       <n>j<minPt> <m><bTagAlgo><bTagCut>
     This will select events with at least n jets with pt > minPt, out of
     which at least m jets have the b-tagging discriminator of type
@@ -36,38 +68,31 @@ def add_jet_selection(selection, process, paths, runOnData, src='analysisPatJets
     are supported:
       CSV, cMVA
     Either kinematic selection or the b-tagging requirement can be
-    omitted.
+    omitted.  An empty string means that no selection is applied.
     
     Arguments:
         selection: String defining the event selection following the
             format described above.
-        process: Process to which producers and filters are added.
-        paths: Paths to which filters are added.
-        runOnData: Flag to disctinguish processing of data and
-            simulation.
-        src: Name of the input collection of jets.
-        verbose: Flag that controls print-out when the configuration is
-            executed.
     
     Return value:
-        None.
-    """
-    
-    if not selection:
-        return
+        An instance of JetSelection.  If a part of the selection is
+        omitted, the corresponding minimal number of jets is zero.
     
+    Raise a RuntimeError if the string cannot be parsed.
+    """
     
-    # Parse the selection string considering several options
     minNumJets = 0
     minPt = 0.
     minBTags = 0
     bTagAlgo = ''
     minBDiscr = -float('inf')
     
-    patternKin = r'(\d+)\s*j\s*(\d+(\.\d+)?)'
-    patternBTag = r'(\d+)\s*([A-Za-z]+)\s*([+-]?\d+(\.\d+)?)'
+    if not selection:
+        return JetSelection(minNumJets, minPt, minBTags, bTagAlgo, minBDiscr)
     
-    match = re.match(r'{}\s+{}'.format(patternKin, patternBTag), selection)
+    
+    # Parse the selection string considering several options
+    match = _jetSelFullRegex.match(selection)
     
     if match:
         minNumJets = int(match.group(1))
@@ -77,14 +102,14 @@ def add_jet_selection(selection, process, paths, runOnData, src='analysisPatJets
         minBDiscr = float(match.group(6))
     
     else:
-        match = re.match(patternKin, selection)
+        match = _jetSelKinRegex.match(selection)
         
         if match:
             minNumJets = int(match.group(1))
             minPt = float(match.group(2))
         
         else:
-            match = re.match(patternBTag, selection)
+            match = _jetSelBTagRegex.match(selection)
             
             if match:
                 minBTags = int(match.group(1))
@@ -94,7 +119,42 @@ def add_jet_selection(selection, process, paths, runOnData, src='analysisPatJets
                 raise RuntimeError('Failed to parse jet selection string "{}".'.format(selection))
     
     
-    if verbose and (minNumJets > 0 or minBTags > 0):
+    if minBTags > 0 and bTagAlgo.upper() not in _bTagAlgoMap:
+        raise RuntimeError(
+            'Uknown label "{}" provided for b-tagging algorithm'.format(bTagAlgo)
+        )
+    
+    return JetSelection(minNumJets, minPt, minBTags, bTagAlgo, minBDiscr)
+
+
+def add_jet_selection(selection, process, paths, runOnData, src='analysisPatJets', verbose=True):
+    """Implement jet selection.
+    
+    Add modules implementing a loose event selection based on properties
+    of jets to the process.
+    
+    Arguments:
+        selection: JetSelection that describes the event selection, as
+            returned by function parse_jet_selection.
+        process: Process to which producers and filters are added.
+        paths: Paths to which filters are added.
+        runOnData: Flag to disctinguish processing of data and
+            simulation.
+        src: Name of the input collection of jets.
+        verbose: Flag that controls print-out when the configuration is
+            executed.
+    
+    Return value:
+        None.
+    """
+    
+    minNumJets, minPt, minBTags, bTagAlgo, minBDiscr = selection
+    
+    if minNumJets == 0 and minBTags == 0:
+        return
+    
+    
+    if verbose:
         print('Will select events with ', end='')
         
         if minNumJets > 0:
@@ -126,17 +186,7 @@ def add_jet_selection(selection, process, paths, runOnData, src='analysisPatJets
     # Selection based on b-tags
     if minBTags > 0:
         
-        bTagAlgoMap = {
-            'CSV': 'pfCombinedInclusiveSecondaryVertexV2BJetTags',
-            'CMVA': 'pfCombinedMVAV2BJetTags'
-        }
-        
-        try:
-            bTagAlgoExpanded = bTagAlgoMap[bTagAlgo.upper()]
-        except KeyError:
-            raise RuntimeError(
-                'Uknown label "{}" provided for b-tagging algorithm'.format(bTagAlgo)
-            )
+        bTagAlgoExpanded = _bTagAlgoMap[bTagAlgo.upper()]
         
         process.bTaggedJetsForEventSelection = cms.EDFilter('PATJetSelector',
             src = cms.InputTag('jetsForEventSelection' if minNumJets > 0 else src),